@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseSettings
 
 
@@ -25,6 +27,15 @@ class Settings(BaseSettings):
 
     PASSWORD_REGEX: str
 
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_BUFFER_SIZE: int = 50
+    PROFILE_TOKEN: Optional[str] = None
+
+    USER_EVENTS_STREAM: str = 'users:events'
+    USER_EVENTS_STREAM_MAXLEN: int = 100000
+    USER_EVENTS_BATCH_SIZE: int = 100
+    USER_EVENTS_POLL_INTERVAL: float = 1.0
+
     class Config:
         env_file = './.env'
 
@@ -2,31 +2,65 @@ from abc import ABC
 from typing import Dict
 
 from pydantic import EmailStr
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas import CreateUserSchema
-from app.models import User, Base
+from app.models import User, UserEvent, Base
 from app.utils import ProcessPassword
+from app.database import async_session
+from app.singleflight import SingleFlight, user_flight
 
 
 class BaseController(ABC):
+    """Data access for one model.
+
+    Reads leave their transaction open and writes commit it. Routes that go on to
+    slow work call release() themselves once they are done with the database.
+    """
     model = None
+    flight: SingleFlight = None
 
     @classmethod
     async def create(cls, db: AsyncSession, data: Dict):
         new_instance = cls.model(**data)
         db.add(new_instance)
+        await db.flush()
+        await cls.record_change(db, new_instance, 'created')
         await db.commit()
         await db.refresh(new_instance)
         return new_instance
 
+    @classmethod
+    async def record_change(cls, db: AsyncSession, obj: Base, event_type: str):
+        pass
+
+    @staticmethod
+    async def release(db: AsyncSession):
+        # ends the transaction so the connection goes back to the pool; loaded instances
+        # stay usable because the session does not expire on commit. This COMMITS, so
+        # only call it when nothing is pending in the session
+        await db.commit()
+
     @classmethod
     async def get(cls, db: AsyncSession, obj_id: str):
         return (await db.execute(
             select(cls.model).filter(cls.model.id == obj_id)
         )).scalar()
 
+    @classmethod
+    async def get_shared(cls, obj_id: str):
+        # concurrent lookups of the same id share one query; it runs in a session of
+        # its own so no request's session is used by another, and the instance comes
+        # back detached
+        return await cls.flight.do(str(obj_id), cls._get_in_own_session, obj_id)
+
+    @classmethod
+    async def _get_in_own_session(cls, obj_id: str):
+        async with async_session() as db:
+            return await cls.get(db, obj_id)
+
     @classmethod
     async def all(cls, db: AsyncSession):
         return [el[0] for el in (await db.execute(select(cls.model)))]
@@ -37,12 +71,15 @@ class BaseController(ABC):
             if hasattr(obj, key):
                 setattr(obj, key, value)
         db.add(obj)
+        await cls.record_change(db, obj, 'updated')
         await db.commit()
         await db.refresh(obj)
         return obj
 
     @classmethod
     async def delete(cls, db: AsyncSession, obj):
+        # recorded first: the row has to still exist to be locked and versioned
+        await cls.record_change(db, obj, 'deleted')
         await db.delete(obj)
         await db.commit()
         return True
@@ -50,6 +87,33 @@ class BaseController(ABC):
 
 class UserController(BaseController):
     model = User
+    flight = user_flight
+
+    @classmethod
+    async def record_change(cls, db: AsyncSession, obj: User, event_type: str):
+        # outbox row: committed or rolled back together with the change itself,
+        # app.events publishes it to the Redis stream afterwards
+        if event_type == 'created':
+            version = obj.version
+        else:
+            # bumping the version locks the user row (pending changes are flushed
+            # first), so versions of one user follow the order their changes commit in
+            version = (await db.execute(
+                update(cls.model)
+                .where(cls.model.id == obj.id)
+                .values(version=cls.model.version + 1)
+                .returning(cls.model.version)
+                .execution_options(synchronize_session=False)
+            )).scalar()
+            if version is None:
+                # deleted by a concurrent request, which published its own event
+                return
+            set_committed_value(obj, 'version', version)
+
+        payload = {'id': str(obj.id), 'version': version}
+        if event_type != 'deleted':
+            payload.update(name=obj.name, email=obj.email, role=obj.role, verified=obj.verified)
+        db.add(UserEvent(user_id=obj.id, version=version, event_type=event_type, payload=payload))
 
     @classmethod
     async def get_by_email(cls, db: AsyncSession, email: EmailStr):
@@ -1,3 +1,9 @@
+import time
+
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,6 +27,54 @@ async_session = sessionmaker(
 )
 
 
+_request_hold_times: ContextVar[Optional[List[float]]] = ContextVar('request_hold_times', default=None)
+
+
+class ConnectionHoldStats:
+    def __init__(self):
+        self.requests = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, hold_ms: float):
+        self.requests += 1
+        self.total_ms += hold_ms
+        self.max_ms = max(self.max_ms, hold_ms)
+
+    def stats(self) -> Dict[str, float]:
+        return {'requests': self.requests,
+                'avg_hold_ms': round(self.total_ms / self.requests, 2) if self.requests else 0.0,
+                'max_hold_ms': round(self.max_ms, 2),
+                'pool_checked_out': engine.sync_engine.pool.checkedout()}
+
+
+connection_hold_stats = ConnectionHoldStats()
+
+
+@event.listens_for(engine.sync_engine.pool, 'checkout')
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_record.info['checked_out_at'] = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine.pool, 'checkin')
+def _on_checkin(dbapi_connection, connection_record):
+    checked_out_at = connection_record.info.pop('checked_out_at', None)
+    hold_times = _request_hold_times.get()
+    if checked_out_at is not None and hold_times is not None:
+        hold_times.append((time.perf_counter() - checked_out_at) * 1000)
+
+
+def track_connection_hold() -> List[float]:
+    # called once per request; every pool checkin in the request's context,
+    # including sessions opened outside get_db, appends its hold time here
+    hold_times = []
+    _request_hold_times.set(hold_times)
+    return hold_times
+
+
 async def get_db():
+    # AsyncSession only checks a connection out of the pool on its first query and
+    # returns it when the transaction ends; routes that do slow work after their
+    # reads end the transaction first (see BaseController.release)
     async with async_session() as db:
         yield db
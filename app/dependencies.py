@@ -1,23 +1,27 @@
 from async_fastapi_jwt_auth import AuthJWT
-from fastapi import Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, HTTPException, Request, status
 
 from app.controllers import UserController
+from app.singleflight import token_flight
 from app.utils import error_handling
-from app.database import get_db
 
 
-@error_handling('access')
-async def get_current_user(db: AsyncSession = Depends(get_db), Authorize: AuthJWT = Depends()):
+async def verify_access_token(Authorize: AuthJWT):
     await Authorize.jwt_required()
-    user_id = await Authorize.get_jwt_subject()
+    return await Authorize.get_jwt_subject()
+
+
+@error_handling('access')
+async def get_current_user(request: Request, Authorize: AuthJWT = Depends()):
+    # identical tokens verify identically, so parallel requests carrying the same one share the work
+    user_id = await token_flight.do(request.headers.get('Authorization'), verify_access_token, Authorize)
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail='Could not refresh access token')
-    user = await UserController.get(db, user_id)
+    user = await UserController.get_shared(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='The user belonging to this token no longer exist'
         )
-    return user
\ No newline at end of file
+    return user
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import logging
+
+from typing import Optional
+
+from sqlalchemy import delete, select
+
+from app.cache import redis_conn
+from app.config import settings
+from app.database import async_session
+from app.models import UserEvent
+
+logger = logging.getLogger("app")
+
+
+async def publish_user_events(batch_size: int = settings.USER_EVENTS_BATCH_SIZE) -> int:
+    """Publishes one batch of outbox rows to the user events stream and deletes them.
+
+    Ordering is only guaranteed per user, through the event's version: rows are
+    taken in insert order, but a transaction can commit after a later one and
+    replicas publish their batches concurrently. Consumers should keep the highest
+    version applied for each user and ignore events at or below it. Delivery is at
+    least once, because a crash between XADD and the commit below publishes the
+    batch again.
+    """
+    async with async_session() as db:
+        events = (await db.execute(
+            select(UserEvent)
+            .order_by(UserEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )).scalars().all()
+        if not events:
+            return 0
+
+        pipe = redis_conn.pipeline(transaction=False)
+        for event in events:
+            pipe.xadd(settings.USER_EVENTS_STREAM,
+                      {'version': event.version,
+                       'type': event.event_type,
+                       'user_id': str(event.user_id),
+                       'payload': json.dumps(event.payload)},
+                      maxlen=settings.USER_EVENTS_STREAM_MAXLEN,
+                      approximate=True)
+        await pipe.execute()
+
+        await db.execute(delete(UserEvent).where(UserEvent.id.in_([event.id for event in events])))
+        await db.commit()
+        return len(events)
+
+
+async def run_user_events_publisher():
+    while True:
+        try:
+            published = await publish_user_events()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Publishing user events failed: {e}")
+            published = 0
+        if published < settings.USER_EVENTS_BATCH_SIZE:
+            await asyncio.sleep(settings.USER_EVENTS_POLL_INTERVAL)
+
+
+_publisher: Optional[asyncio.Task] = None
+
+
+def start_user_events_publisher():
+    global _publisher
+    _publisher = asyncio.create_task(run_user_events_publisher())
+
+
+async def stop_user_events_publisher():
+    if _publisher:
+        _publisher.cancel()
+        try:
+            await _publisher
+        except asyncio.CancelledError:
+            pass
@@ -6,20 +6,26 @@ import time
 from logging.config import dictConfig
 from uuid import uuid4
 from async_fastapi_jwt_auth.exceptions import AuthJWTException
-from fastapi import FastAPI, Request, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.openapi.utils import get_openapi
 from fastapi.exceptions import RequestValidationError
 from fastapi.encoders import jsonable_encoder
 
 from app.config import settings, LogConfig
 from app.routers import user, auth
+from app.database import connection_hold_stats, track_connection_hold
+from app.events import start_user_events_publisher, stop_user_events_publisher
+from app.profiling import PROFILE_HEADER, profiler
+from app.roles import RoleChecker
+from app.singleflight import singleflight_stats
 
 dictConfig(LogConfig().dict())
 logger = logging.getLogger("app")
 
 app = FastAPI()
+allow_admin = RoleChecker(['admin'])
 
 origins = [
     settings.CLIENT_ORIGIN,
@@ -34,17 +40,34 @@ app.add_middleware(
 )
 
 
+@app.on_event('startup')
+async def startup():
+    start_user_events_publisher()
+
+
+@app.on_event('shutdown')
+async def shutdown():
+    await stop_user_events_publisher()
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     req_id = uuid4()
     logger.info(f"rid={req_id} Start Request Path={request.url.path}")
     start_time = time.time()
+    hold_times = track_connection_hold()
+    profile = profiler.start() if profiler.should_profile(request.headers.get(PROFILE_HEADER)) else None
 
     try:
         response = await call_next(request)
     except Exception as e:
         logger.error(e.args[0])
         raise e
+    finally:
+        connection_hold_stats.record(sum(hold_times))
+        if profile:
+            profiler.stop(profile, str(req_id), request.method, request.url.path,
+                          (time.time() - start_time) * 1000)
 
     process_time = (time.time() - start_time) * 1000
     formatted_process_time = '{0:.2f}'.format(process_time)
@@ -80,6 +103,33 @@ async def root():
     return {'message': 'Hello World'}
 
 
+@app.get('/api/metrics',
+         dependencies=[Depends(allow_admin)])
+async def metrics():
+    return {'singleflight': singleflight_stats(),
+            'db_connections': connection_hold_stats.stats()}
+
+
+@app.get('/api/profiles',
+         dependencies=[Depends(allow_admin)])
+async def get_profiles():
+    return profiler.list()
+
+
+@app.get('/api/profiles/{profile_id}',
+         dependencies=[Depends(allow_admin)])
+async def get_profile(profile_id: str, output_format: str = Query('text', alias='format')):
+    profile = profiler.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=f'No profiles with {profile_id} id')
+    if output_format == 'pstats':
+        return Response(content=profile.dump(),
+                        media_type='application/octet-stream',
+                        headers={'Content-Disposition': f'attachment; filename="{profile_id}.prof"'})
+    return PlainTextResponse(profile.report())
+
+
 def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
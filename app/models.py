@@ -1,7 +1,7 @@
 import uuid
 
-from sqlalchemy import TIMESTAMP, Column, String, Boolean, text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import TIMESTAMP, BigInteger, Column, String, Boolean, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from app.database import Base
 
@@ -19,3 +19,15 @@ class User(Base):
                         nullable=False, server_default=text("now()"))
     updated_at = Column(TIMESTAMP(timezone=True),
                         nullable=False, server_default=text("now()"))
+    version = Column(BigInteger, nullable=False, default=1, server_default='1')
+
+
+class UserEvent(Base):
+    __tablename__ = 'user_events'
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    version = Column(BigInteger, nullable=False)
+    event_type = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True),
+                        nullable=False, server_default=text("now()"))
@@ -6,6 +6,11 @@ from pydantic import BaseSettings
 
 from app.config import settings
 from app.cache import redis_conn
+from app.singleflight import denylist_flight
+from app.utils import TokenSigner
+
+JWT_PUBLIC_KEY = base64.b64decode(settings.JWT_PUBLIC_KEY).decode('utf-8')
+JWT_PRIVATE_KEY = base64.b64decode(settings.JWT_PRIVATE_KEY).decode('utf-8')
 
 
 class Settings(BaseSettings):
@@ -15,13 +20,17 @@ class Settings(BaseSettings):
     authjwt_access_cookie_key: str = 'access_token'
     authjwt_refresh_cookie_key: str = 'refresh_token'
     authjwt_cookie_csrf_protect: bool = False
-    authjwt_public_key: str = base64.b64decode(settings.JWT_PUBLIC_KEY).decode('utf-8')
-    authjwt_private_key: str = base64.b64decode(settings.JWT_PRIVATE_KEY).decode('utf-8')
+    authjwt_public_key: str = JWT_PUBLIC_KEY
+    authjwt_private_key: str = JWT_PRIVATE_KEY
     authjwt_denylist_enabled: bool = True
     authjwt_denylist_token_checks: set = {"access", "refresh"}
     authjwt_secret_key: str = settings.SECRET_KEY
 
 
+token_signer = TokenSigner(settings.JWT_ALGORITHM,
+                           settings.SECRET_KEY if settings.JWT_ALGORITHM.startswith('HS') else JWT_PRIVATE_KEY)
+
+
 @AuthJWT.load_config
 def get_config():
     return Settings()
@@ -30,5 +39,5 @@ def get_config():
 @AuthJWT.token_in_denylist_loader
 async def check_if_token_in_denylist(decrypted_token):
     jti = decrypted_token['jti']
-    entry = await redis_conn.get(jti)
+    entry = await denylist_flight.do(jti, redis_conn.get, jti)
     return entry and entry == 'expired'
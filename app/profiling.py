@@ -0,0 +1,86 @@
+import cProfile
+import io
+import marshal
+import pstats
+import random
+import secrets
+import time
+
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from app.config import settings
+
+PROFILE_HEADER = 'X-Profile-Token'
+
+
+class RequestProfile:
+    def __init__(self, req_id: str, method: str, path: str, duration_ms: float, stats: pstats.Stats):
+        self.req_id = req_id
+        self.method = method
+        self.path = path
+        self.duration_ms = duration_ms
+        self.created_at = time.time()
+        self.stats = stats
+
+    def summary(self) -> Dict:
+        return {'id': self.req_id,
+                'method': self.method,
+                'path': self.path,
+                'duration_ms': round(self.duration_ms, 2),
+                'created_at': self.created_at}
+
+    def dump(self) -> bytes:
+        # same format as pstats.Stats.dump_stats, loadable with pstats or snakeviz
+        return marshal.dumps(self.stats.stats)
+
+    def report(self, limit: int = 50) -> str:
+        stream = io.StringIO()
+        self.stats.stream = stream
+        self.stats.sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+
+class Profiler:
+    """Opt-in cProfile capture for a sampled fraction of requests.
+
+    cProfile sees the whole event loop thread, so only one request is profiled at
+    a time and its profile includes whatever else the loop ran meanwhile.
+    """
+
+    def __init__(self, sample_rate: float, buffer_size: int, token: Optional[str]):
+        self.sample_rate = sample_rate
+        self.token = token
+        self.profiles: Deque[RequestProfile] = deque(maxlen=buffer_size)
+        self._active = False
+
+    def should_profile(self, header_value: Optional[str]) -> bool:
+        if self._active:
+            return False
+        # headers are decoded as latin-1, compare_digest only takes ASCII str
+        if header_value and self.token and secrets.compare_digest(header_value.encode('latin-1'),
+                                                                  self.token.encode('utf-8')):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self) -> cProfile.Profile:
+        self._active = True
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def stop(self, profile: cProfile.Profile, req_id: str, method: str, path: str, duration_ms: float):
+        profile.disable()
+        self._active = False
+        self.profiles.append(RequestProfile(req_id, method, path, duration_ms, pstats.Stats(profile)))
+
+    def list(self) -> List[Dict]:
+        return [profile.summary() for profile in reversed(self.profiles)]
+
+    def get(self, req_id: str) -> Optional[RequestProfile]:
+        return next((profile for profile in self.profiles if profile.req_id == req_id), None)
+
+
+profiler = Profiler(sample_rate=settings.PROFILE_SAMPLE_RATE,
+                    buffer_size=settings.PROFILE_BUFFER_SIZE,
+                    token=settings.PROFILE_TOKEN)
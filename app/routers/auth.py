@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.utils import ProcessPassword, ProcessToken, error_handling
 from app.database import get_db
-from app.oauth2 import AuthJWT, redis_conn
+from app.oauth2 import AuthJWT, redis_conn, token_signer
 from app.config import settings
 from app.controllers import UserController
 from app.schemas import CreateUserSchema, UserResponse, LoginUserSchema, TokensResponse, StatusResponse
@@ -22,6 +22,8 @@ REFRESH_TOKEN_EXPIRES_IN = settings.REFRESH_TOKEN_EXPIRES_IN
              response_model=UserResponse)
 async def create_user(payload: CreateUserSchema, db: AsyncSession = Depends(get_db)):
     user = await UserController.get_by_email(db, EmailStr(payload.email.lower()))
+    # hashing the password below takes a while, don't hold the pool connection through it
+    await UserController.release(db)
     if user:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT,
                             detail='Account already exist')
@@ -34,8 +36,10 @@ async def create_user(payload: CreateUserSchema, db: AsyncSession = Depends(get_
 @router.post('/login',
              status_code=status.HTTP_200_OK,
              response_model=TokensResponse)
-async def login(payload: LoginUserSchema, db: AsyncSession = Depends(get_db), Authorize: AuthJWT = Depends()):
+async def login(payload: LoginUserSchema, db: AsyncSession = Depends(get_db)):
     user = await UserController.get_by_email(db, EmailStr(payload.email.lower()))
+    # bcrypt below takes a while, don't hold the pool connection through it
+    await UserController.release(db)
     if not user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail='Incorrect Email or Password')
@@ -48,7 +52,7 @@ async def login(payload: LoginUserSchema, db: AsyncSession = Depends(get_db), Au
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail='Incorrect Email or Password')
 
-    access_token, refresh_token = await ProcessToken.generate_tokens(authorize=Authorize,
+    access_token, refresh_token = await ProcessToken.generate_tokens(signer=token_signer,
                                                                      subject=str(user.id),
                                                                      access_expires_time=ACCESS_TOKEN_EXPIRES_IN,
                                                                      refresh_expires_time=REFRESH_TOKEN_EXPIRES_IN)
@@ -69,13 +73,14 @@ async def refresh_access_token(Authorize: AuthJWT = Depends(), db: AsyncSession
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail='Could not refresh access token')
     user = await UserController.get(db, user_id)
+    await UserController.release(db)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail='The user belonging to this token no longer exist')
 
     await redis_conn.setex(jti, timedelta(days=REFRESH_TOKEN_EXPIRES_IN), 'expired')
 
-    access_token, refresh_token = await ProcessToken.generate_tokens(authorize=Authorize,
+    access_token, refresh_token = await ProcessToken.generate_tokens(signer=token_signer,
                                                                      subject=str(user.id),
                                                                      access_expires_time=ACCESS_TOKEN_EXPIRES_IN,
                                                                      refresh_expires_time=REFRESH_TOKEN_EXPIRES_IN)
@@ -87,13 +92,13 @@ async def refresh_access_token(Authorize: AuthJWT = Depends(), db: AsyncSession
 @router.get('/token/verify',
             status_code=status.HTTP_200_OK,
             response_model=UserResponse)
-async def get_me(db: AsyncSession = Depends(get_db), Authorize: AuthJWT = Depends()):
+async def get_me(Authorize: AuthJWT = Depends()):
     await Authorize.jwt_required()
     user_id = await Authorize.get_jwt_subject()
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail='Could not refresh access token')
-    user = await UserController.get(db, user_id)
+    user = await UserController.get_shared(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -19,6 +19,8 @@ allow_manage_users = RoleChecker(['admin'])
              dependencies=[Depends(allow_manage_users)])
 async def create_user(payload: CreateUserSchema, db: AsyncSession = Depends(get_db)):
     user = await UserController.get_by_email(db, EmailStr(payload.email.lower()))
+    # hashing the password below takes a while, don't hold the pool connection through it
+    await UserController.release(db)
     if user:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT,
                             detail='Account already exist')
@@ -0,0 +1,54 @@
+import asyncio
+
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one in-flight coroutine.
+
+    The first caller for a key (the leader) starts the work, every caller that
+    arrives while it is still running awaits the same result instead of
+    repeating it. Nothing is cached once the call finishes.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        if key is None:
+            return await func(*args, **kwargs)
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            future = asyncio.ensure_future(func(*args, **kwargs))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        # shield so a cancelled waiter does not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            # mark the exception as retrieved even if every waiter went away
+            future.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {'calls': self.calls,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._in_flight)}
+
+
+user_flight = SingleFlight('user')
+denylist_flight = SingleFlight('denylist')
+token_flight = SingleFlight('token')
+
+
+def singleflight_stats() -> Dict[str, Dict[str, int]]:
+    return {flight.name: flight.stats() for flight in (user_flight, denylist_flight, token_flight)}
@@ -1,9 +1,13 @@
-from typing import Callable
+import json
+
+from typing import Callable, Dict, Tuple
 from functools import wraps
+from uuid import uuid4
 from fastapi import status, HTTPException
 from passlib.context import CryptContext
-from async_fastapi_jwt_auth import AuthJWT
-from datetime import timedelta
+from jwt.algorithms import get_default_algorithms
+from jwt.utils import base64url_encode
+from datetime import datetime, timedelta, timezone
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -18,17 +22,54 @@ class ProcessPassword:
         return pwd_context.verify(password, hashed_password)
 
 
+class TokenSigner:
+    """Signs tokens with a key object parsed once at startup.
+
+    jwt.encode re-loads the PEM key material for every token, which for RSA costs
+    about as much as the signature itself. The tokens carry the same claims
+    AuthJWT puts in its own, so AuthJWT keeps verifying them as before.
+    """
+
+    def __init__(self, algorithm: str, signing_key: str):
+        self.algorithm = algorithm
+        self._algorithm = get_default_algorithms()[algorithm]
+        self._signing_key = self._algorithm.prepare_key(signing_key)
+        self._header = self._encode_segment({'alg': algorithm, 'typ': 'JWT'})
+
+    @staticmethod
+    def _encode_segment(data: Dict) -> bytes:
+        return base64url_encode(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+
+    def sign(self, payload: Dict) -> str:
+        signing_input = self._header + b'.' + self._encode_segment(payload)
+        signature = self._algorithm.sign(signing_input, self._signing_key)
+        return (signing_input + b'.' + base64url_encode(signature)).decode('utf-8')
+
+    def sign_pair(self, subject: str, access_expires: timedelta, refresh_expires: timedelta) -> Tuple[str, str]:
+        now = datetime.now(timezone.utc)
+        issued_at = int(now.timestamp())
+        claims = {'sub': subject, 'iat': issued_at, 'nbf': issued_at}
+        access_token = self.sign({**claims,
+                                  'jti': str(uuid4()),
+                                  'exp': int((now + access_expires).timestamp()),
+                                  'type': 'access',
+                                  'fresh': False})
+        refresh_token = self.sign({**claims,
+                                   'jti': str(uuid4()),
+                                   'exp': int((now + refresh_expires).timestamp()),
+                                   'type': 'refresh'})
+        return access_token, refresh_token
+
+
 class ProcessToken:
     @staticmethod
-    async def generate_tokens(authorize: AuthJWT,
+    async def generate_tokens(signer: TokenSigner,
                               subject: str,
                               access_expires_time: int,
                               refresh_expires_time: int):
-        access_token = await authorize.create_access_token(subject=subject,
-                                                           expires_time=timedelta(minutes=access_expires_time))
-        refresh_token = await authorize.create_refresh_token(subject=subject,
-                                                             expires_time=timedelta(days=refresh_expires_time))
-        return access_token, refresh_token
+        return signer.sign_pair(subject=subject,
+                                access_expires=timedelta(minutes=access_expires_time),
+                                refresh_expires=timedelta(days=refresh_expires_time))
 
 
 def error_handling(token_type: str):
@@ -0,0 +1,68 @@
+"""Compare JWT signing and verification throughput per algorithm.
+
+Run from the repository root with ``python -m benchmarks.jwt_signing``. Keys are
+generated in memory, so no .env is needed. For every algorithm it times the
+per-token ``jwt.encode``/``jwt.decode`` path AuthJWT takes with PEM strings
+against TokenSigner with its pre-parsed key objects, and ``jwt.decode`` with a
+pre-parsed public key.
+"""
+import time
+
+import jwt
+
+from jwt.algorithms import get_default_algorithms
+
+from datetime import timedelta
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from app.utils import TokenSigner
+
+ITERATIONS = 500
+
+
+def pem_pair(private_key):
+    private_pem = private_key.private_bytes(serialization.Encoding.PEM,
+                                            serialization.PrivateFormat.PKCS8,
+                                            serialization.NoEncryption()).decode('utf-8')
+    public_pem = private_key.public_key().public_bytes(serialization.Encoding.PEM,
+                                                       serialization.PublicFormat.SubjectPublicKeyInfo).decode('utf-8')
+    return private_pem, public_pem
+
+
+# The app verifies a token on every authenticated request but signs only on login
+# and refresh, and AuthJWT verifies with the PEM string (the decode/s column). Pick
+# the algorithm on decode/s first: RS256 verifies faster than ES256 or EdDSA.
+KEYS = {
+    'HS256': ('benchmark-secret-key-benchmark-secret-key', 'benchmark-secret-key-benchmark-secret-key'),
+    'RS256': pem_pair(rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+    'ES256': pem_pair(ec.generate_private_key(ec.SECP256R1())),
+    'EdDSA': pem_pair(ed25519.Ed25519PrivateKey.generate()),
+}
+
+
+def per_second(func) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func()
+    return ITERATIONS / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'algorithm':<10}{'encode/s':>12}{'pair/s':>12}{'decode/s':>12}{'verify/s':>12}")
+    for algorithm, (private_key, public_key) in KEYS.items():
+        signer = TokenSigner(algorithm, private_key)
+        verifying_key = get_default_algorithms()[algorithm].prepare_key(public_key)
+        access_token, _ = signer.sign_pair('benchmark', timedelta(minutes=15), timedelta(days=1))
+        payload = jwt.decode(access_token, public_key, algorithms=[algorithm])
+
+        encode = per_second(lambda: jwt.encode(payload, private_key, algorithm=algorithm))
+        pair = per_second(lambda: signer.sign_pair('benchmark', timedelta(minutes=15), timedelta(days=1)))
+        decode = per_second(lambda: jwt.decode(access_token, public_key, algorithms=[algorithm]))
+        verify = per_second(lambda: jwt.decode(access_token, verifying_key, algorithms=[algorithm]))
+        # encode signs one token, sign_pair two: compare encode/s with 2 * pair/s
+        print(f'{algorithm:<10}{encode:>12.0f}{pair:>12.0f}{decode:>12.0f}{verify:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
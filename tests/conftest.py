@@ -0,0 +1,23 @@
+import os
+
+# app.config reads these at import time; the values only need to parse
+for name, value in {
+    'DATABASE_PORT': '5432',
+    'POSTGRES_PASSWORD': 'postgres',
+    'POSTGRES_USER': 'postgres',
+    'POSTGRES_DB': 'postgres',
+    'POSTGRES_HOST': 'localhost',
+    'POSTGRES_HOSTNAME': 'localhost',
+    'REDIS_PASSWORD': 'redis',
+    'REDIS_HOST': 'localhost',
+    'REDIS_PORT': '6379',
+    'JWT_PUBLIC_KEY': '',
+    'JWT_PRIVATE_KEY': '',
+    'JWT_ALGORITHM': 'HS256',
+    'SECRET_KEY': 'secret',
+    'REFRESH_TOKEN_EXPIRES_IN': '60',
+    'ACCESS_TOKEN_EXPIRES_IN': '15',
+    'CLIENT_ORIGIN': 'http://localhost:3000',
+    'PASSWORD_REGEX': '.*',
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,34 @@
+import marshal
+
+from app.profiling import Profiler
+
+
+def capture(profiler: Profiler):
+    profile = profiler.start()
+    sorted(range(1000), reverse=True)
+    profiler.stop(profile, 'rid', 'GET', '/api/healthchecker', 1.0)
+    return profiler.get('rid')
+
+
+def test_report_and_dump_of_captured_profile():
+    stored = capture(Profiler(sample_rate=0.0, buffer_size=2, token=None))
+
+    assert 'function calls' in stored.report()
+    assert isinstance(marshal.loads(stored.dump()), dict)
+
+
+def test_ring_buffer_keeps_latest_profiles():
+    profiler = Profiler(sample_rate=0.0, buffer_size=2, token=None)
+    for req_id in ('a', 'b', 'c'):
+        profiler.stop(profiler.start(), req_id, 'GET', '/', 1.0)
+
+    assert [profile['id'] for profile in profiler.list()] == ['c', 'b']
+
+
+def test_token_header():
+    profiler = Profiler(sample_rate=0.0, buffer_size=2, token='s3cret')
+
+    assert profiler.should_profile('s3cret')
+    assert not profiler.should_profile('wrong')
+    assert not profiler.should_profile('\xe9')
+    assert not profiler.should_profile(None)
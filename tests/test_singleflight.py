@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from app.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight('test')
+    executions = []
+
+    async def work(value):
+        executions.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def main():
+        return await asyncio.gather(*[flight.do('key', work, 3) for _ in range(10)])
+
+    assert asyncio.run(main()) == [6] * 10
+    assert executions == [3]
+    assert flight.stats() == {'calls': 1, 'coalesced': 9, 'in_flight': 0}
+
+
+def test_exception_reaches_every_waiter():
+    flight = SingleFlight('test')
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError('boom')
+
+    async def main():
+        return await asyncio.gather(*[flight.do('key', fail) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_cancelling_leader_does_not_cancel_followers():
+    flight = SingleFlight('test')
+
+    async def work():
+        await asyncio.sleep(0.01)
+        return 'done'
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do('key', work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do('key', work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == 'done'
+    assert flight.stats() == {'calls': 1, 'coalesced': 1, 'in_flight': 0}
+
+
+def test_none_key_is_not_coalesced():
+    flight = SingleFlight('test')
+    executions = []
+
+    async def work():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*[flight.do(None, work) for _ in range(3)])
+
+    asyncio.run(main())
+    assert len(executions) == 3
+    assert flight.stats() == {'calls': 0, 'coalesced': 0, 'in_flight': 0}
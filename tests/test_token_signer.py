@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+import jwt
+import pytest
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from app.utils import TokenSigner
+
+
+def pem_pair(private_key):
+    private_pem = private_key.private_bytes(serialization.Encoding.PEM,
+                                            serialization.PrivateFormat.PKCS8,
+                                            serialization.NoEncryption()).decode('utf-8')
+    public_pem = private_key.public_key().public_bytes(serialization.Encoding.PEM,
+                                                       serialization.PublicFormat.SubjectPublicKeyInfo).decode('utf-8')
+    return private_pem, public_pem
+
+
+KEYS = {
+    'HS256': lambda: ('test-secret-key-test-secret-key-00', 'test-secret-key-test-secret-key-00'),
+    'RS256': lambda: pem_pair(rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+    'ES256': lambda: pem_pair(ec.generate_private_key(ec.SECP256R1())),
+    'EdDSA': lambda: pem_pair(ed25519.Ed25519PrivateKey.generate()),
+}
+
+
+@pytest.mark.parametrize('algorithm', KEYS)
+def test_sign_pair_matches_authjwt_claims(algorithm):
+    private_key, public_key = KEYS[algorithm]()
+    access_token, refresh_token = TokenSigner(algorithm, private_key).sign_pair(
+        'user-id', timedelta(minutes=15), timedelta(days=1))
+
+    for token in (access_token, refresh_token):
+        assert jwt.get_unverified_header(token) == {'alg': algorithm, 'typ': 'JWT'}
+
+    access = jwt.decode(access_token, public_key, algorithms=[algorithm])
+    refresh = jwt.decode(refresh_token, public_key, algorithms=[algorithm])
+
+    assert set(access) == {'sub', 'iat', 'nbf', 'jti', 'exp', 'type', 'fresh'}
+    assert set(refresh) == {'sub', 'iat', 'nbf', 'jti', 'exp', 'type'}
+    assert access['type'] == 'access' and access['fresh'] is False
+    assert refresh['type'] == 'refresh'
+    assert access['sub'] == refresh['sub'] == 'user-id'
+    assert access['iat'] == access['nbf']
+    assert access['exp'] - access['iat'] == 15 * 60
+    assert refresh['exp'] - refresh['iat'] == 24 * 60 * 60
+    assert access['jti'] != refresh['jti']